@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import aiofiles
+
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentCache:
+    """On-disk LRU cache of aligned byte ranges served through the proxy.
+
+    Files are cached as fixed-size segments aligned to segment_bytes
+    boundaries, keyed by (filename, validator, segment index) where the
+    validator is the upstream ETag or Last-Modified value. Repeated reads
+    of the same byte windows (video scrubbing, sqlite-over-http, columnar
+    reads) are then served from local disk instead of crossing the SSH
+    tunnel. Segment data lives as individual files in cache_dir; metadata
+    (per-file validators and LRU bookkeeping) lives in a small sqlite db.
+    """
+
+    def __init__(self, cache_dir: str, segment_bytes: int = 1 << 20, max_bytes: int = 4 << 30):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(self.cache_dir / "segments.db")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "filename TEXT PRIMARY KEY, validator TEXT, total_size INTEGER)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "key TEXT PRIMARY KEY, filename TEXT, size INTEGER, last_access REAL)"
+        )
+        self._db.commit()
+        self._lock = asyncio.Lock()
+
+    def _key(self, filename: str, validator: str, index: int) -> str:
+        return hashlib.sha1(f"{filename}\n{validator}\n{index}".encode()).hexdigest()
+
+    def _segment_path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def segment_path_for(self, filename: str, validator: str, index: int) -> Path:
+        return self._segment_path(self._key(filename, validator, index))
+
+    def has_segment(self, filename: str, validator: str, index: int) -> bool:
+        """Check for a cached segment and refresh its LRU slot, without reading it."""
+        key = self._key(filename, validator, index)
+        if not self._segment_path(key).exists():
+            return False
+        self._db.execute(
+            "UPDATE segments SET last_access = ? WHERE key = ?", (time.time(), key)
+        )
+        self._db.commit()
+        return True
+
+    def segment_indices(self, start: int, end: int) -> range:
+        """Indices of the aligned segments covering the byte range [start, end]."""
+        return range(start // self.segment_bytes, end // self.segment_bytes + 1)
+
+    def get_file_meta(self, filename: str) -> Optional[Tuple[str, int]]:
+        row = self._db.execute(
+            "SELECT validator, total_size FROM files WHERE filename = ?", (filename,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_file_meta(self, filename: str, validator: str, total_size: int):
+        """Record the file's validator, dropping stale segments if it changed."""
+        meta = self.get_file_meta(filename)
+        if meta and meta[0] != validator:
+            self.invalidate(filename)
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (filename, validator, total_size) VALUES (?, ?, ?)",
+            (filename, validator, total_size)
+        )
+        self._db.commit()
+
+    def invalidate(self, filename: str):
+        rows = self._db.execute(
+            "SELECT key FROM segments WHERE filename = ?", (filename,)
+        ).fetchall()
+        for (key,) in rows:
+            self._segment_path(key).unlink(missing_ok=True)
+        self._db.execute("DELETE FROM segments WHERE filename = ?", (filename,))
+        self._db.execute("DELETE FROM files WHERE filename = ?", (filename,))
+        self._db.commit()
+
+    async def write_segment(self, filename: str, validator: str, index: int, data: bytes):
+        key = self._key(filename, validator, index)
+        async with self._lock:
+            async with aiofiles.open(self._segment_path(key), 'wb') as f:
+                await f.write(data)
+            self._db.execute(
+                "INSERT OR REPLACE INTO segments (key, filename, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, filename, len(data), time.time())
+            )
+            self._db.commit()
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM segments").fetchone()
+        while total > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM segments ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if not row:
+                break
+            key, size = row
+            self._segment_path(key).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM segments WHERE key = ?", (key,))
+            total -= size
+            logger.debug("Evicted cache segment %s (%d bytes)", key, size)
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class ResponseCache:
+    """Whole-response cache driven by HTTP validators.
+
+    Stores the last full body seen for each file together with its ETag /
+    Last-Modified. The proxy revalidates with If-None-Match /
+    If-Modified-Since; an upstream 304 carries zero body bytes, so an
+    unchanged file costs one round trip over the tunnel instead of a full
+    transfer and is served from local disk.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 4 << 30):
+        self.cache_dir = Path(cache_dir).expanduser() / "responses"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(self.cache_dir / "responses.db")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "filename TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "content_type TEXT, size INTEGER, last_access REAL)"
+        )
+        self._db.commit()
+
+    def path(self, filename: str) -> Path:
+        return self.cache_dir / hashlib.sha1(filename.encode()).hexdigest()
+
+    def tmp_path(self, filename: str) -> Path:
+        """A fresh temp file per call: concurrent fetches of the same file
+        each write their own copy and commit() promotes whichever finishes,
+        instead of truncating each other mid-write."""
+        fd, name = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=self.path(filename).name + '.', suffix='.tmp'
+        )
+        os.close(fd)
+        return Path(name)
+
+    def get(self, filename: str) -> Optional[dict]:
+        row = self._db.execute(
+            "SELECT etag, last_modified, content_type, size FROM responses WHERE filename = ?",
+            (filename,)
+        ).fetchone()
+        if not row or not self.path(filename).exists():
+            return None
+        self._db.execute(
+            "UPDATE responses SET last_access = ? WHERE filename = ?", (time.time(), filename)
+        )
+        self._db.commit()
+        return {"etag": row[0], "last_modified": row[1], "content_type": row[2], "size": row[3]}
+
+    def commit(self, filename: str, etag: Optional[str], last_modified: Optional[str],
+               content_type: Optional[str], tmp_path: Path):
+        """Atomically promote a fully-written temp file into the cache."""
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, self.path(filename))
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (filename, etag, last_modified, content_type, size, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (filename, etag, last_modified, content_type, size, time.time())
+        )
+        self._db.commit()
+        self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while total > self.max_bytes:
+            row = self._db.execute(
+                "SELECT filename, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if not row:
+                break
+            filename, size = row
+            self.path(filename).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM responses WHERE filename = ?", (filename,))
+            total -= size
+            logger.debug("Evicted cached response for %s (%d bytes)", filename, size)
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
@@ -1,11 +1,19 @@
 import os
+import re
+import asyncio
 import argparse
+import functools
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-import httpx
-from sshtunnel import SSHTunnelForwarder
-import paramiko
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse, FileResponse, JSONResponse
+from starlette.routing import Route
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+import fnmatch
 import logging
 import signal
 import sys
@@ -14,10 +22,16 @@ from pydantic_settings import BaseSettings
 from typing import Optional
 from pathlib import Path
 from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from urllib.parse import quote
+
+import aiofiles
+
+from .cache import SegmentCache, ResponseCache
 
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("PROXY_LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +47,17 @@ class Settings(BaseSettings):
     local_port: int = 8000
     remote_port: int = 8001
     fastapi_port: int = 5000
+
+    # Local cache for ranged reads and revalidated full responses;
+    # set to an empty string to disable caching entirely
+    cache_dir: str = "~/.cache/data_stream"
+
+    # Concurrency caps: simultaneous proxied transfers and per-IP rate
+    max_inflight: int = 32
+
+    # Chunk size for proxied streams; 1 MiB keeps coroutine hops and
+    # chunked-encoding framing low for large files
+    chunk_bytes: int = 1 << 20
     
     class Config:
         env_prefix = "PROXY_"
@@ -46,45 +71,121 @@ class SSHConfig:
     port: int = 22
 
 
+@functools.lru_cache(maxsize=1)
+def _parsed_ssh_config():
+    """Parse ~/.ssh/config once per process, however many providers exist."""
+    entries = []
+    ssh_config_path = Path.home() / '.ssh' / 'config'
+    if not ssh_config_path.exists():
+        logger.warning("No SSH config file found at ~/.ssh/config")
+        return entries
+    current = None
+    with open(ssh_config_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.replace('=', ' ', 1).split(None, 1)
+            if len(parts) != 2:
+                continue
+            key, value = parts[0].lower(), parts[1].strip()
+            if key == 'host':
+                current = (value.split(), {})
+                entries.append(current)
+            elif current is not None:
+                current[1].setdefault(key, value)
+    return entries
+
+
+@functools.lru_cache(maxsize=64)
+def _lookup_ssh_host(host_alias: str) -> dict:
+    result = {}
+    for patterns, options in _parsed_ssh_config():
+        # OpenSSH semantics: any matching negated pattern excludes the
+        # block, regardless of other patterns matching.
+        if any(fnmatch.fnmatchcase(host_alias, p[1:]) for p in patterns if p.startswith('!')):
+            continue
+        if any(fnmatch.fnmatchcase(host_alias, p) for p in patterns if not p.startswith('!')):
+            for key, value in options.items():
+                result.setdefault(key, value)
+    return result
+
+
 class SSHConfigProvider:
-    def __init__(self):
-        self.ssh_config = paramiko.SSHConfig()
-        self._load_ssh_config()
-
-    def _load_ssh_config(self):
-        ssh_config_path = Path.home() / '.ssh' / 'config'
-        if ssh_config_path.exists():
-            with open(ssh_config_path) as f:
-                self.ssh_config.parse(f)
-        else:
-            logger.warning("No SSH config file found at ~/.ssh/config")
+    """Resolves host aliases from ~/.ssh/config.
+
+    Only the keys this service needs (hostname, user, identityfile, port)
+    are handled; like OpenSSH, the first matching value for a key wins.
+    Parsing and lookups are memoized, so per-request or multi-host callers
+    never re-read or re-walk the config file.
+    """
 
     def get_ssh_config(self, host_alias: str) -> SSHConfig:
-        host_config = self.ssh_config.lookup(host_alias)
+        host_config = _lookup_ssh_host(host_alias)
+        # IdentityFile is almost always written as ~/.ssh/...; asyncssh
+        # opens client_keys paths literally, so expand it here.
+        identity_file = host_config.get('identityfile')
         return SSHConfig(
             hostname=host_config.get('hostname', host_alias),
             username=host_config.get('user'),
-            key_filename=host_config.get('identityfile', [None])[0],
+            key_filename=os.path.expanduser(identity_file) if identity_file else None,
             port=int(host_config.get('port', 22))
         )
 
 
-app = FastAPI(title="Data Proxy Service")
+class SSHSessionPool:
+    """Runs remote commands as channels multiplexed over one SSH connection.
+
+    asyncssh opens each command as a channel on the already-established
+    connection, so no exec pays a fresh SSH handshake. Concurrency is
+    bounded just below sshd's default MaxSessions (10); raise
+    MaxSessions/MaxStartups on the server if more parallel channels are
+    needed.
+    """
+
+    def __init__(self, conn, max_sessions: int = 9):
+        self._conn = conn
+        self._semaphore = asyncio.Semaphore(max_sessions)
+
+    async def run(self, command: str):
+        async with self._semaphore:
+            return await self._conn.run(command, check=False)
+
+
+limiter = Limiter(key_func=get_remote_address)
 
 
 class DataProxyService:
     def __init__(self, settings: Settings):
+        # Deferred so CLI startup and per-worker forks don't pay for the
+        # import graph before a service is actually constructed.
+        import httpx
+
         self.settings = settings
         self.tunnel = None
-        self.ssh_client = None
-        self.client = httpx.AsyncClient()
+        self.ssh_conn = None
+        self.ssh_pool = None
+        # Shared client kept open for the process lifetime so connections to
+        # the tunneled HTTP server are pooled and kept alive across requests.
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            http2=False,
+            timeout=None
+        )
         self.ssh_config_provider = SSHConfigProvider()
         self.ssh_config = self._get_ssh_config()
+        self.segment_cache = SegmentCache(settings.cache_dir) if settings.cache_dir else None
+        self.response_cache = ResponseCache(settings.cache_dir) if settings.cache_dir else None
+        self.inflight = asyncio.Semaphore(settings.max_inflight)
+        # Base URL built once (rebound in start() once the tunnel reports
+        # its actual port); request paths are appended pre-quoted so httpx
+        # never re-parses or re-escapes a full URL per request.
+        self._base = f"http://127.0.0.1:{settings.local_port}/"
 
     def _get_ssh_config(self) -> SSHConfig:
         if self.settings.ssh_host_alias:
             # Use SSH config file
-            logger.info(f"Using SSH config alias: {self.settings.ssh_host_alias}")
+            logger.info("Using SSH config alias: %s", self.settings.ssh_host_alias)
             return self.ssh_config_provider.get_ssh_config(self.settings.ssh_host_alias)
         else:
             # Use direct SSH parameters
@@ -96,102 +197,440 @@ class DataProxyService:
             )
 
     async def start(self):
+        import asyncssh
+
         try:
-            logger.info(f"Connecting using SSH config: {self.ssh_config}")
+            logger.info("Connecting using SSH config: %s", self.ssh_config)
             
-            # Start SSH tunnel
-            self.tunnel = SSHTunnelForwarder(
+            # One asyncssh connection carries the port forward and every
+            # remote command as multiplexed channels, natively on the event
+            # loop — no thread-pool offload per SSH operation.
+            self.ssh_conn = await asyncssh.connect(
                 self.ssh_config.hostname,
-                ssh_username=self.ssh_config.username,
-                ssh_pkey=self.ssh_config.key_filename,
-                ssh_port=self.ssh_config.port,
-                remote_bind_address=('127.0.0.1', self.settings.remote_port),
-                local_bind_address=('127.0.0.1', self.settings.local_port)
+                port=self.ssh_config.port,
+                username=self.ssh_config.username,
+                client_keys=[self.ssh_config.key_filename] if self.ssh_config.key_filename else None,
+                known_hosts=None
             )
-            self.tunnel.start()
 
-            # Start HTTP server on remote host
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            self.ssh_client.connect(
-                hostname=self.ssh_config.hostname,
-                username=self.ssh_config.username,
-                key_filename=self.ssh_config.key_filename,
-                port=self.ssh_config.port
+            # Forward the local port to the HTTP server on the remote host.
+            # Port 0 asks the OS for an ephemeral port (used when several
+            # workers each need their own forward), so read the bound port
+            # back from the listener before building upstream URLs.
+            self.tunnel = await self.ssh_conn.forward_local_port(
+                '127.0.0.1', self.settings.local_port,
+                '127.0.0.1', self.settings.remote_port
             )
+            self._base = f"http://127.0.0.1:{self.tunnel.get_port()}/"
+
+            self.ssh_pool = SSHSessionPool(self.ssh_conn)
+
+            # Upload the Range-capable file server next to the data; write
+            # to a per-process temp name and rename so concurrent workers
+            # never read a half-written file.
+            remote_server_src = Path(__file__).parent / "remote_server.py"
+            remote_server_dst = f"{self.settings.data_path}/remote_server.py"
+            remote_server_tmp = f"{remote_server_dst}.{os.getpid()}"
+            async with self.ssh_conn.start_sftp_client() as sftp:
+                await sftp.put(str(remote_server_src), remote_server_tmp)
+            await self.ssh_pool.run(f"mv -f {remote_server_tmp} {remote_server_dst}")
+
+            # The launch below is backgrounded with its output discarded, so
+            # a missing remote dependency would otherwise surface only as
+            # connection-refused errors on every request. Check up front and
+            # fail startup with a clear message instead.
+            probe = await self.ssh_pool.run('python3 -c "import uvicorn, starlette"')
+            if probe.exit_status != 0:
+                raise RuntimeError(
+                    f"python3 on {self.ssh_config.hostname} cannot import uvicorn/starlette; "
+                    f"install them on the remote host (pip install starlette uvicorn): "
+                    f"{(probe.stderr or '').strip()}"
+                )
+
+            # Serve the data with uvicorn workers so concurrent range reads
+            # proceed in parallel instead of queueing on one blocking thread.
+            # The guard matches the full launch command — port and data path
+            # included — so a server for another port is left alone, while a
+            # stale server holding this port for a different directory is
+            # replaced. The [p] in the patterns keeps pgrep/pkill from
+            # matching the very shell that runs them.
+            launch = (f"python3 -m uvicorn remote_server:app --host 127.0.0.1 "
+                      f"--port {self.settings.remote_port} --workers 4 "
+                      f"--app-dir {self.settings.data_path}")
+            exact_pattern = launch.replace("remote_server:app", "remote_server:ap[p]")
+            port_pattern = (f"uvicorn remote_server:ap[p] --host 127.0.0.1 "
+                            f"--port {self.settings.remote_port} ")
+            cmd = (f"pgrep -f '{exact_pattern}' > /dev/null || "
+                   f"(pkill -f '{port_pattern}'; "
+                   f"cd {self.settings.data_path} && nohup {launch} > /dev/null 2>&1 &)")
+            await self.ssh_pool.run(cmd)
             
-            # Kill any existing Python HTTP servers on the remote port
-            self.ssh_client.exec_command(f"pkill -f 'python -m http.server {self.settings.remote_port}'")
-            
-            # Start a new HTTP server in the background
-            cmd = f"cd {self.settings.data_path} && python3 -m http.server {self.settings.remote_port} > /dev/null 2>&1 &"
-            self.ssh_client.exec_command(cmd)
-            
-            logger.info(f"Data proxy service started. Access data at http://localhost:{self.settings.fastapi_port}/data/")
+            logger.info("Data proxy service started. Access data at http://localhost:%d/data/", self.settings.fastapi_port)
             
         except Exception as e:
-            logger.error(f"Failed to start data proxy service: {e}")
+            logger.error("Failed to start data proxy service: %s", e)
             await self.stop()
             raise
 
     async def stop(self):
         await self.client.aclose()
-        if self.ssh_client:
-            self.ssh_client.close()
+        if self.segment_cache:
+            self.segment_cache.close()
+        if self.response_cache:
+            self.response_cache.close()
         if self.tunnel:
-            self.tunnel.stop()
+            self.tunnel.close()
+        if self.ssh_conn:
+            self.ssh_conn.close()
+            await self.ssh_conn.wait_closed()
 
 
 # Global service instance
 proxy_service = None
 
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app):
     global proxy_service
     settings = Settings()
     proxy_service = DataProxyService(settings)
     await proxy_service.start()
+    # Prewarm the httpx pool with one throwaway request so the first real
+    # request doesn't pay the TCP handshake into the tunnel.
+    try:
+        await proxy_service.client.head(proxy_service._base)
+    except Exception as e:
+        logger.warning("Upstream warmup request failed: %s", e)
+    yield
+    await proxy_service.stop()
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    if proxy_service:
-        await proxy_service.stop()
+# Client headers worth forwarding upstream: range and conditional requests
+# let the upstream serve partial/unchanged content instead of the full file.
+FORWARDED_HEADERS = {"range", "if-range", "if-none-match", "if-modified-since", "accept-encoding"}
 
-@app.get("/data/{filename:path}")
-async def proxy_data(filename: str):
-    try:
-        url = f'http://127.0.0.1:{proxy_service.settings.local_port}/{filename}'
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="File not found")
-            
-            async def iterfile():
-                async for chunk in response.aiter_bytes():
+# Hop-by-hop headers never forwarded downstream. Content-Length is not in
+# this set: bodies are proxied verbatim, so the upstream length stays valid
+# and range responses keep their exact size.
+EXCLUDED_HEADERS = frozenset({"transfer-encoding", "connection"})
+
+# Bounded single ranges are the only shape the segment cache understands;
+# open-ended and suffix ranges fall through to the plain proxy path.
+RANGE_PATTERN = re.compile(r"bytes=(\d+)-(\d+)$")
+
+# Widest range the segment cache will serve. Miss fills buffer whole
+# segments in memory, so this bounds per-request RSS; anything wider
+# (download managers asking for bytes=0-4294967295) streams through the
+# plain proxy path instead.
+MAX_CACHE_SEGMENTS = 8
+
+# Relative paths only, no parent-directory components and no NUL — anything
+# else is a legal filename (+, %, ~, parentheses, ...). Checked before any
+# upstream I/O so traversal probes are rejected without an SSH round trip.
+SAFE_PATH_PATTERN = re.compile(r"\A(?!/)(?!(?:.*/)?\.\.(?:/|\Z))[^\x00]+\Z")
+
+
+async def _serve_range_from_cache(filename: str, start: int, end: int):
+    """Serve a bounded byte range via the local segment cache.
+
+    Misses are filled with a single upstream request widened to segment
+    boundaries, so small client reads prefetch their surrounding window
+    and later reads of nearby bytes never touch the tunnel. Returns None
+    when the range cannot be satisfied from the cache machinery (upstream
+    without range support, missing validators, changed file), in which
+    case the caller falls back to plain proxying.
+    """
+    cache = proxy_service.segment_cache
+    indices = cache.segment_indices(start, end)
+    if len(indices) > MAX_CACHE_SEGMENTS:
+        return None
+    meta = cache.get_file_meta(filename)
+    validator, total = meta if meta else (None, None)
+    segments = {}
+    if meta:
+        missing = [i for i in indices if not cache.has_segment(filename, validator, i)]
+    else:
+        missing = list(indices)
+
+    # Fill misses one contiguous run at a time so cached segments sitting
+    # between them are never refetched.
+    runs = []
+    for i in missing:
+        if runs and i == runs[-1][-1] + 1:
+            runs[-1].append(i)
+        else:
+            runs.append([i])
+
+    url = proxy_service._base + quote(filename, safe="/")
+    for run in runs:
+        fetch_start = run[0] * cache.segment_bytes
+        fetch_end = (run[-1] + 1) * cache.segment_bytes - 1
+        # Open as a stream and check the status first: an upstream that
+        # ignores Range answers 200 with the whole file, which must not be
+        # buffered here — only a confirmed 206 window is read into memory.
+        upstream_request = proxy_service.client.build_request(
+            "GET", url, headers={"Range": f"bytes={fetch_start}-{fetch_end}"}
+        )
+        upstream = await proxy_service.client.send(upstream_request, stream=True)
+        if upstream.status_code != 206:
+            await upstream.aclose()
+            return None
+        run_validator = upstream.headers.get('etag') or upstream.headers.get('last-modified')
+        content_range = upstream.headers.get('content-range', '')
+        if not run_validator or '/' not in content_range:
+            await upstream.aclose()
+            return None
+        if validator is not None and run_validator != validator:
+            # File changed upstream: drop stale segments, let this request
+            # take the plain path and re-warm the cache on the next read.
+            await upstream.aclose()
+            cache.invalidate(filename)
+            return None
+        validator = run_validator
+        total = int(content_range.rsplit('/', 1)[-1])
+        cache.set_file_meta(filename, validator, total)
+        try:
+            body = await upstream.aread()
+        finally:
+            await upstream.aclose()
+        for i in run:
+            offset = (i - run[0]) * cache.segment_bytes
+            data = body[offset:offset + cache.segment_bytes]
+            if data:
+                await cache.write_segment(filename, validator, i, data)
+                segments[i] = data
+
+    if start >= total:
+        return None
+    end = min(end, total - 1)
+
+    # Segments fetched this request are sliced from memory; segments already
+    # on disk are streamed straight from their files rather than buffered.
+    async def iterfile():
+        for i in cache.segment_indices(start, end):
+            seg_start = i * cache.segment_bytes
+            lo = max(start - seg_start, 0)
+            hi = min(end - seg_start + 1, cache.segment_bytes)
+            data = segments.get(i)
+            if data is not None:
+                yield data[lo:hi]
+                continue
+            async with aiofiles.open(cache.segment_path_for(filename, validator, i), 'rb') as f:
+                if lo:
+                    await f.seek(lo)
+                remaining = hi - lo
+                while remaining > 0:
+                    chunk = await f.read(remaining)
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
                     yield chunk
 
-            return StreamingResponse(
-                iterfile(),
-                media_type=response.headers.get('content-type'),
-                headers={k: v for k, v in response.headers.items() if k.lower() != 'content-length'}
-            )
+    return StreamingResponse(
+        iterfile(),
+        status_code=206,
+        headers={
+            "Content-Range": f"bytes {start}-{end}/{total}",
+            "Content-Length": str(end - start + 1),
+            "Accept-Ranges": "bytes",
+        }
+    )
+
+
+def _serve_cached_response(filename: str, cache_entry: dict) -> FileResponse:
+    """Serve a revalidated body from the local response cache.
+
+    FileResponse lets uvicorn take the sendfile/zero-copy path, so cached
+    bytes move kernel-to-socket without per-chunk Python copies.
+    """
+    return FileResponse(
+        proxy_service.response_cache.path(filename),
+        media_type=cache_entry['content_type'],
+        headers=_validator_headers(cache_entry)
+    )
+
+
+@limiter.limit(lambda: os.environ.get("PROXY_RATE", "200/minute"))
+async def proxy_data(request: Request):
+    filename = request.path_params["filename"]
+    if not SAFE_PATH_PATTERN.match(filename):
+        raise HTTPException(status_code=400, detail="Invalid path")
+    # Bound concurrent proxied transfers so a burst of large-file requests
+    # cannot pile up on the tunnel's bandwidth and memory. The permit must
+    # outlive this handler: the body streams after the response object is
+    # returned, so it is released by a background task that Starlette runs
+    # once the response has been fully sent (streamed, cached and file
+    # responses alike). Error paths release immediately.
+    await proxy_service.inflight.acquire()
+    try:
+        response = await _proxy_data(filename, request)
+    except BaseException:
+        proxy_service.inflight.release()
+        raise
+    response.background = BackgroundTask(proxy_service.inflight.release)
+    return response
+
+
+async def _proxy_data(filename: str, request: Request):
+    import httpx
+
+    try:
+        if proxy_service.segment_cache:
+            range_header = request.headers.get('range')
+            match = RANGE_PATTERN.match(range_header) if range_header else None
+            if match:
+                start, end = int(match.group(1)), int(match.group(2))
+                if start <= end:
+                    cached = await _serve_range_from_cache(filename, start, end)
+                    if cached is not None:
+                        return cached
+
+        url = proxy_service._base + quote(filename, safe="/")
+        forward_headers = {k: v for k, v in request.headers.items() if k.lower() in FORWARDED_HEADERS}
+
+        # Revalidate full-file requests against the local response cache:
+        # attach our stored validators unless the client sent its own, and
+        # serve from disk when the upstream answers 304 Not Modified.
+        response_cache = proxy_service.response_cache
+        client_conditional = 'if-none-match' in forward_headers or 'if-modified-since' in forward_headers
+        cache_entry = None
+        if response_cache and 'range' not in forward_headers:
+            cache_entry = response_cache.get(filename)
+            if cache_entry and not client_conditional:
+                if cache_entry['etag']:
+                    forward_headers['If-None-Match'] = cache_entry['etag']
+                if cache_entry['last_modified']:
+                    forward_headers['If-Modified-Since'] = cache_entry['last_modified']
+
+        upstream_request = proxy_service.client.build_request("GET", url, headers=forward_headers)
+        response = await proxy_service.client.send(upstream_request, stream=True)
+
+        if response.status_code == 304 and cache_entry and not client_conditional:
+            await response.aclose()
+            return _serve_cached_response(filename, cache_entry)
+
+        # Tee cacheable full responses to disk while streaming them out, so
+        # the next request can be answered with a 304 revalidation.
+        cacheable = (response_cache is not None and response.status_code == 200
+                     and 'range' not in forward_headers
+                     and (response.headers.get('etag') or response.headers.get('last-modified')))
+
+        async def iterfile():
+            try:
+                if cacheable:
+                    tmp = response_cache.tmp_path(filename)
+                    try:
+                        async with aiofiles.open(tmp, 'wb') as f:
+                            async for chunk in response.aiter_raw(chunk_size=proxy_service.settings.chunk_bytes):
+                                await f.write(chunk)
+                                yield chunk
+                        response_cache.commit(
+                            filename,
+                            response.headers.get('etag'),
+                            response.headers.get('last-modified'),
+                            response.headers.get('content-type'),
+                            tmp
+                        )
+                    except BaseException:
+                        tmp.unlink(missing_ok=True)
+                        raise
+                else:
+                    async for chunk in response.aiter_raw(chunk_size=proxy_service.settings.chunk_bytes):
+                        yield chunk
+            finally:
+                await response.aclose()
+
+        # httpx.Headers deletes case-insensitively in C-level dict ops, so no
+        # per-header .lower() comparison runs on the hot path.
+        response_headers = httpx.Headers(response.headers)
+        for header in EXCLUDED_HEADERS:
+            response_headers.pop(header, None)
+        response_headers['accept-ranges'] = 'bytes'
+
+        return StreamingResponse(
+            iterfile(),
+            status_code=response.status_code,
+            media_type=response.headers.get('content-type'),
+            headers=dict(response_headers)
+        )
+    except httpx.HTTPError as e:
+        # Genuine transport failures only; upstream HTTP statuses (404, 416,
+        # 503, ...) flow through StreamingResponse verbatim so clients and
+        # caches can react to them.
+        logger.error("Error proxying data: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _validator_headers(cache_entry: dict) -> dict:
+    headers = {"Accept-Ranges": "bytes"}
+    if cache_entry['etag']:
+        headers['ETag'] = cache_entry['etag']
+    if cache_entry['last_modified']:
+        headers['Last-Modified'] = cache_entry['last_modified']
+    return headers
+
+
+async def proxy_data_head(request: Request):
+    """Answer HEAD probes from the local validator cache when possible.
+
+    Clients commonly probe with HEAD or conditional requests to discover
+    length and validators before issuing range reads; when the response
+    cache already knows them, nothing needs to cross the tunnel.
+    """
+    filename = request.path_params["filename"]
+    if not SAFE_PATH_PATTERN.match(filename):
+        raise HTTPException(status_code=400, detail="Invalid path")
+    cache = proxy_service.response_cache
+    cache_entry = cache.get(filename) if cache else None
+
+    if cache_entry:
+        headers = _validator_headers(cache_entry)
+        if_none_match = request.headers.get('if-none-match')
+        if_modified_since = request.headers.get('if-modified-since')
+        if ((if_none_match and if_none_match == cache_entry['etag']) or
+                (if_modified_since and if_modified_since == cache_entry['last_modified'])):
+            return Response(status_code=304, headers=headers)
+        headers['Content-Length'] = str(cache_entry['size'])
+        return Response(status_code=200, headers=headers,
+                        media_type=cache_entry['content_type'])
+
+    # Unknown file: a HEAD upstream still moves no body bytes
+    import httpx
+
+    url = proxy_service._base + quote(filename, safe="/")
+    forward_headers = {k: v for k, v in request.headers.items() if k.lower() in FORWARDED_HEADERS}
+    try:
+        response = await proxy_service.client.head(url, headers=forward_headers)
     except httpx.HTTPError as e:
-        logger.error(f"Error proxying data: {e}")
+        logger.error("Error proxying HEAD: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in EXCLUDED_HEADERS}
+    return Response(status_code=response.status_code, headers=headers)
+
 
-@app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     ssh_config = proxy_service.ssh_config
-    return {
+    return JSONResponse({
         "status": "OK",
         "connection": {
             "hostname": ssh_config.hostname,
             "username": ssh_config.username,
             "using_ssh_config": proxy_service.settings.ssh_host_alias is not None
         }
-    }
+    })
+
+
+# Plain Starlette routes: the streaming path needs no pydantic validation or
+# dependency injection, so every request skips those per-request layers.
+app = Starlette(
+    routes=[
+        # The HEAD route must precede the GET route: Starlette expands
+        # methods=["GET"] to also accept HEAD.
+        Route("/data/{filename:path}", proxy_data_head, methods=["HEAD"]),
+        Route("/data/{filename:path}", proxy_data, methods=["GET"]),
+        Route("/health", health_check),
+    ],
+    lifespan=lifespan,
+    exception_handlers={RateLimitExceeded: _rate_limit_exceeded_handler},
+)
+app.state.limiter = limiter
 
 def signal_handler(sig, frame):
     logger.info("Shutting down gracefully...")
@@ -209,6 +648,13 @@ def main():
     parser.add_argument('--local-port', type=int, default=8000, help='Local port for SSH tunnel')
     parser.add_argument('--remote-port', type=int, default=8001, help='Remote port for HTTP server')
     parser.add_argument('--fastapi-port', type=int, default=5001, help='FastAPI server port')
+    parser.add_argument('--cache-dir',
+                        help='Directory for the local cache (default ~/.cache/data_stream; '
+                             'pass an empty string to disable caching)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of uvicorn worker processes; with more than one, '
+                             'each worker opens its own ephemeral tunnel port and '
+                             '--local-port is ignored')
     
     args = parser.parse_args()
     
@@ -230,12 +676,26 @@ def main():
             os.environ["PROXY_SSH_KEY_PATH"] = args.ssh_key_path
     
     os.environ["PROXY_DATA_PATH"] = args.data_path
-    os.environ["PROXY_LOCAL_PORT"] = str(args.local_port)
+    # A fixed local port can only be bound by one worker; with several,
+    # each asks the OS for its own ephemeral forward port instead.
+    os.environ["PROXY_LOCAL_PORT"] = "0" if args.workers > 1 else str(args.local_port)
     os.environ["PROXY_REMOTE_PORT"] = str(args.remote_port)
     os.environ["PROXY_FASTAPI_PORT"] = str(args.fastapi_port)
+    if args.cache_dir is not None:
+        os.environ["PROXY_CACHE_DIR"] = args.cache_dir
     
-    # Run the FastAPI app with uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=args.fastapi_port)
+    # Run the FastAPI app with uvicorn. The app is passed as an import
+    # string so each worker process builds its own proxy_service from the
+    # environment; uvloop and httptools replace the stdlib event loop and
+    # HTTP parser with their C implementations.
+    uvicorn.run(
+        "data_stream.data_stream:app",
+        host="0.0.0.0",
+        port=args.fastapi_port,
+        loop="uvloop",
+        http="httptools",
+        workers=args.workers
+    )
 if __name__ == "__main__":
     main()
     
@@ -0,0 +1,27 @@
+"""Minimal Range-capable file server run on the remote host.
+
+Uploaded over SFTP by the proxy and launched under uvicorn in place of
+`python -m http.server`, whose single blocking thread serialized
+concurrent reads through the tunnel. Files are served relative to the
+working directory; Starlette's FileResponse supplies Range, ETag and
+Last-Modified handling natively.
+"""
+import os
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse
+from starlette.routing import Route
+
+
+async def serve_file(request):
+    root = os.getcwd()
+    path = os.path.normpath(os.path.join(root, request.path_params["filename"]))
+    if not path.startswith(root + os.sep):
+        raise HTTPException(status_code=403)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404)
+    return FileResponse(path)
+
+
+app = Starlette(routes=[Route("/{filename:path}", serve_file)])